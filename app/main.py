@@ -14,9 +14,13 @@ from models.symptom_analyzer import SymptomAnalyzer
 from utils.timeline_manager import TimelineManager
 from utils.image_utils import (
     validate_image, preprocess_image, create_comparison_view,
-    add_size_reference
+    add_size_reference, load_display_image
 )
 from utils.config import Config
+from utils.logging_config import configure_logging
+
+# Logging - WARNING in production, INFO with DEBUG_MODE (override via LOG_LEVEL)
+configure_logging()
 
 # Page configuration
 st.set_page_config(
@@ -42,23 +46,43 @@ def load_css():
 
 load_css()
 
+# Shared model instances - built once per server process instead of once per session
+# (stateless after init; constructors that raise are not cached and retry next session)
+@st.cache_resource(show_spinner=False)
+def get_abcde_analyzer() -> ABCDEAnalyzer:
+    """Shared ABCDE analyzer"""
+    return ABCDEAnalyzer()
+
+
+@st.cache_resource(show_spinner=False)
+def get_medgemma_client() -> MedGemmaClient:
+    """Shared Med-Gemma client"""
+    return MedGemmaClient()
+
+
+@st.cache_resource(show_spinner=False)
+def get_symptom_analyzer() -> SymptomAnalyzer:
+    """Shared symptom analyzer"""
+    return SymptomAnalyzer()
+
+
 # Initialize session state
 if 'timeline_manager' not in st.session_state:
     st.session_state.timeline_manager = TimelineManager()
 
 if 'abcde_analyzer' not in st.session_state:
-    st.session_state.abcde_analyzer = ABCDEAnalyzer()
+    st.session_state.abcde_analyzer = get_abcde_analyzer()
 
 if 'medgemma_client' not in st.session_state:
     try:
-        st.session_state.medgemma_client = MedGemmaClient()
+        st.session_state.medgemma_client = get_medgemma_client()
     except ValueError as e:
         st.session_state.medgemma_client = None
         st.warning(f"⚠️ Med-Gemma unavailable: {e}. Please configure GOOGLE_API_KEY in .env file.")
 
 if 'symptom_analyzer' not in st.session_state:
     try:
-        st.session_state.symptom_analyzer = SymptomAnalyzer()
+        st.session_state.symptom_analyzer = get_symptom_analyzer()
     except ValueError as e:
         st.session_state.symptom_analyzer = None
 
@@ -368,7 +392,7 @@ def page_timeline_tracking():
         
         with col2:
             if os.path.exists(entry['image_path']):
-                img = Image.open(entry['image_path'])
+                img = load_display_image(entry['image_path'])
                 st.image(img, use_container_width=True)
         
         with col3:
@@ -391,14 +415,14 @@ def page_timeline_tracking():
             with col1:
                 st.markdown("**Earlier Scan**")
                 if os.path.exists(comparison['entry1']['image_path']):
-                    st.image(Image.open(comparison['entry1']['image_path']))
+                    st.image(load_display_image(comparison['entry1']['image_path']))
                 st.markdown(f"Date: {datetime.fromisoformat(comparison['entry1']['timestamp']).strftime('%Y-%m-%d')}")
                 st.markdown(f"Score: {comparison['entry1']['abcde_score']}/11")
             
             with col2:
                 st.markdown("**Recent Scan**")
                 if os.path.exists(comparison['entry2']['image_path']):
-                    st.image(Image.open(comparison['entry2']['image_path']))
+                    st.image(load_display_image(comparison['entry2']['image_path']))
                 st.markdown(f"Date: {datetime.fromisoformat(comparison['entry2']['timestamp']).strftime('%Y-%m-%d')}")
                 st.markdown(f"Score: {comparison['entry2']['abcde_score']}/11")
             
@@ -2,14 +2,22 @@
 ABCDE Criteria Analyzer for Melanoma Risk Assessment
 Implements clinical ABCDE criteria (Asymmetry, Border, Color, Diameter, Evolution)
 """
+import copy
+import hashlib
+import logging
+import threading
+from collections import OrderedDict
 import numpy as np
 import cv2
 from PIL import Image
-from typing import Dict, Tuple
+from typing import Dict, Optional, Tuple
 from sklearn.cluster import KMeans
 from utils.config import Config
 
 
+logger = logging.getLogger(__name__)
+
+
 class ABCDEAnalyzer:
     """
     Analyzes skin lesions using ABCDE criteria for melanoma risk assessment
@@ -17,6 +25,8 @@ class ABCDEAnalyzer:
     
     def __init__(self):
         self.risk_thresholds = Config.RISK_THRESHOLDS
+        self._result_cache = OrderedDict()
+        self._cache_lock = threading.Lock()
         
     def analyze(self, image: Image.Image, previous_data: Dict = None) -> Dict:
         """
@@ -29,19 +39,29 @@ class ABCDEAnalyzer:
         Returns:
             Dictionary with ABCDE scores and risk assessment
         """
+        # Downscale once to bound segmentation/clustering cost
+        # scale maps analysis pixels back to source-image pixels for size metrics
+        analysis_image, scale = self._prepare_image(image)
+        
         # Convert to numpy array
-        img_array = np.array(image)
+        img_array = np.array(analysis_image)
+        
+        # Re-submitted photo (same pixels, same previous data): reuse the earlier result
+        cache_key = self._cache_key(img_array, image.size, previous_data)
+        cached = self._get_cached_result(cache_key)
+        if cached is not None:
+            return cached
         
         # Get lesion mask (segmentation)
         lesion_mask = self._segment_lesion(img_array)
         
         # Calculate each criterion
         asymmetry_score, asymmetry_desc = self._analyze_asymmetry(lesion_mask)
-        border_score, border_desc = self._analyze_border(lesion_mask)
+        border_score, border_desc = self._analyze_border(lesion_mask, scale)
         color_score, color_desc = self._analyze_color(img_array, lesion_mask)
-        diameter_score, diameter_desc, size_mm = self._analyze_diameter(lesion_mask)
+        diameter_score, diameter_desc, size_mm = self._analyze_diameter(lesion_mask, scale)
         evolution_score, evolution_desc = self._analyze_evolution(
-            img_array, lesion_mask, previous_data
+            img_array, lesion_mask, previous_data, scale
         )
         
         # Calculate total risk
@@ -50,7 +70,7 @@ class ABCDEAnalyzer:
         
         risk_level = self._calculate_risk_level(total_score)
         
-        return {
+        result = {
             "abcde_scores": {
                 "asymmetry": asymmetry_score,
                 "border": border_score,
@@ -70,10 +90,71 @@ class ABCDEAnalyzer:
             "risk_level": risk_level,
             "visual_features": {
                 "size_mm": round(size_mm, 1),
-                "lesion_area": int(np.sum(lesion_mask > 0)),
+                "lesion_area": int(np.count_nonzero(lesion_mask) / scale ** 2),
                 "lesion_mask": lesion_mask
             }
         }
+        self._cache_result(cache_key, result)
+        return result
+    
+    @staticmethod
+    def _cache_key(img_array: np.ndarray, source_size: Tuple[int, int],
+                   previous_data: Optional[Dict]) -> str:
+        """
+        Exact-content key for the result cache
+        
+        Deliberately not a perceptual hash: near-identical photos of two different
+        lesions must never share a result
+        """
+        digest = hashlib.blake2b(img_array.tobytes(), digest_size=16)
+        digest.update(repr((img_array.shape, source_size)).encode())
+        if previous_data:
+            digest.update(repr(sorted(previous_data.items())).encode())
+        return digest.hexdigest()
+    
+    def _get_cached_result(self, key: str) -> Optional[Dict]:
+        """Return a copy of the cached result for key, or None"""
+        with self._cache_lock:
+            result = self._result_cache.get(key)
+            if result is None:
+                return None
+            self._result_cache.move_to_end(key)
+        return copy.deepcopy(result)
+    
+    def _cache_result(self, key: str, result: Dict):
+        """Store a copy of result, evicting the least recently used entry when full"""
+        result = copy.deepcopy(result)
+        with self._cache_lock:
+            self._result_cache[key] = result
+            self._result_cache.move_to_end(key)
+            while len(self._result_cache) > Config.ABCDE_CACHE_SIZE:
+                self._result_cache.popitem(last=False)
+    
+    def _prepare_image(self, image: Image.Image) -> Tuple[Image.Image, float]:
+        """
+        Convert to RGB and downscale to Config.ANALYSIS_MAX_DIMENSION
+        Works on a copy - the caller's image (saved to the timeline) is untouched
+        
+        Args:
+            image: PIL Image of skin lesion
+            
+        Returns:
+            (analysis_image, scale) - scale is analysis size / source size (<= 1.0)
+        """
+        if image.mode != 'RGB':
+            image = image.convert('RGB')
+        
+        width, height = image.size
+        max_dim = Config.ANALYSIS_MAX_DIMENSION
+        if max(width, height) <= max_dim:
+            return image, 1.0
+        
+        ratio = max_dim / max(width, height)
+        new_size = (max(1, round(width * ratio)), max(1, round(height * ratio)))
+        # BILINEAR (antialiased in Pillow) is ~3x cheaper than LANCZOS on phone photos,
+        # and the sharper kernel makes no difference to segmentation or color clustering
+        resized = image.resize(new_size, Image.Resampling.BILINEAR)
+        return resized, new_size[0] / width
     
     def _segment_lesion(self, img_array: np.ndarray) -> np.ndarray:
         """
@@ -151,7 +232,7 @@ class ABCDEAnalyzer:
             
         except Exception as e:
             # If GrabCut fails, use fallback method
-            print(f"GrabCut failed: {e}, using fallback")
+            logger.warning("GrabCut failed: %s, using fallback", e)
             return self._fallback_center_segmentation(img_array)
     
     def _fallback_center_segmentation(self, img_array: np.ndarray) -> np.ndarray:
@@ -254,9 +335,10 @@ class ABCDEAnalyzer:
         top_half = top_half[-min_h:, :]
         bottom_half_flipped = bottom_half_flipped[:min_h, :]
         
-        # Calculate horizontal asymmetry
-        h_diff = np.sum(np.abs(top_half.astype(float) - bottom_half_flipped.astype(float)))
-        h_total = np.sum(top_half) + np.sum(bottom_half_flipped)
+        # Calculate horizontal asymmetry (mismatched pixels over lesion pixels -
+        # the mask is binary, so counting avoids float copies of both halves)
+        h_diff = np.count_nonzero(top_half != bottom_half_flipped)
+        h_total = np.count_nonzero(top_half) + np.count_nonzero(bottom_half_flipped)
         h_asymmetry = h_diff / (h_total + 1e-6)
         
         # Vertical split
@@ -270,8 +352,8 @@ class ABCDEAnalyzer:
         right_half_flipped = right_half_flipped[:, :min_w]
         
         # Calculate vertical asymmetry
-        v_diff = np.sum(np.abs(left_half.astype(float) - right_half_flipped.astype(float)))
-        v_total = np.sum(left_half) + np.sum(right_half_flipped)
+        v_diff = np.count_nonzero(left_half != right_half_flipped)
+        v_total = np.count_nonzero(left_half) + np.count_nonzero(right_half_flipped)
         v_asymmetry = v_diff / (v_total + 1e-6)
         
         # Average asymmetry
@@ -285,10 +367,14 @@ class ABCDEAnalyzer:
         else:
             return 2, "Highly asymmetric - significant differences between halves"
     
-    def _analyze_border(self, lesion_mask: np.ndarray) -> Tuple[int, str]:
+    def _analyze_border(self, lesion_mask: np.ndarray, scale: float = 1.0) -> Tuple[int, str]:
         """
         Analyze border regularity using edge detection
         
+        Args:
+            lesion_mask: Binary lesion mask
+            scale: Analysis-to-source pixel ratio (smoothness is normalized in source pixels)
+        
         Returns:
             (score, description) - 0-2 points
         """
@@ -314,7 +400,7 @@ class ABCDEAnalyzer:
         # Also check contour smoothness using approximation
         epsilon = 0.01 * perimeter
         approx = cv2.approxPolyDP(contour, epsilon, True)
-        smoothness = len(approx) / (perimeter / 10)  # Normalized by perimeter
+        smoothness = len(approx) / (perimeter / scale / 10)  # Normalized by source perimeter
         
         # Scoring based on irregularity
         if circularity > 0.8 and smoothness < 2:
@@ -405,10 +491,14 @@ class ABCDEAnalyzer:
         
         return color_names
     
-    def _analyze_diameter(self, lesion_mask: np.ndarray) -> Tuple[int, str, float]:
+    def _analyze_diameter(self, lesion_mask: np.ndarray, scale: float = 1.0) -> Tuple[int, str, float]:
         """
         Analyze lesion diameter with improved calibration
         
+        Args:
+            lesion_mask: Binary lesion mask
+            scale: Analysis-to-source pixel ratio (calibration uses source resolution)
+        
         Returns:
             (score, description, size_mm) - 0-2 points
         """
@@ -421,8 +511,8 @@ class ABCDEAnalyzer:
         contour = max(contours, key=cv2.contourArea)
         x, y, w, h = cv2.boundingRect(contour)
         
-        # Maximum diameter in pixels
-        max_diameter_px = max(w, h)
+        # Maximum diameter in source-image pixels
+        max_diameter_px = max(w, h) / scale
         
         # IMPROVED CALIBRATION v1.2:
         # Previous assumption was too naive (10 pixels per mm)
@@ -432,7 +522,7 @@ class ABCDEAnalyzer:
         # - Real width captured ~5-10 cm
         # Therefore: ~60-80 pixels per cm, or ~6-8 pixels per mm
         
-        image_width = lesion_mask.shape[1]
+        image_width = lesion_mask.shape[1] / scale
         
         # Adaptive calibration based on image size
         if image_width > 2000:  # High res photo
@@ -463,7 +553,7 @@ class ABCDEAnalyzer:
             return 2, f"Large lesion (> 6mm: {size_mm:.1f}mm)", size_mm
     
     def _analyze_evolution(self, img_array: np.ndarray, lesion_mask: np.ndarray,
-                          previous_data: Dict = None) -> Tuple[int, str]:
+                          previous_data: Dict = None, scale: float = 1.0) -> Tuple[int, str]:
         """
         Analyze evolution by comparing with previous images
         
@@ -473,8 +563,8 @@ class ABCDEAnalyzer:
         if previous_data is None:
             return 0, "No previous data for comparison"
         
-        # Extract current features
-        current_size = np.sum(lesion_mask > 0)
+        # Extract current features (area in source pixels, comparable to stored lesion_area)
+        current_size = np.count_nonzero(lesion_mask) / scale ** 2
         current_pixels = img_array[lesion_mask > 0]
         current_mean_color = np.mean(current_pixels, axis=0)
         
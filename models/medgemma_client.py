@@ -5,9 +5,61 @@ Integrates Google's Med-Gemma model for dermatology analysis interpretation
 import google.generativeai as genai
 from typing import Dict, Optional
 from utils.config import Config
+from utils.circuit_breaker import CircuitBreaker
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor, TimeoutError as FutureTimeoutError
+import logging
+import random
+import threading
 import time
 
 
+logger = logging.getLogger(__name__)
+
+# Retry backoff: full jitter, sleep ~ U(0, BASE * 2**attempt), bounded total elapsed time
+RETRY_BASE_SECONDS = 1.0
+RETRY_MAX_ELAPSED_SECONDS = 20.0
+
+# Generation runs here so the caller can stop waiting after MEDGEMMA_TIMEOUT_SECONDS
+# (a timed-out call is cancelled if still queued; if already running it finishes in
+# the background and its result is discarded)
+_GENERATION_POOL = ThreadPoolExecutor(max_workers=4, thread_name_prefix="medgemma")
+
+# Static task instructions appended to every prompt (built once at import)
+PROMPT_TASK_INSTRUCTIONS = """
+
+**YOUR TASK:**
+Please provide a structured response with the following sections:
+
+1. **Plain Language Explanation** (2-3 sentences)
+   - Explain what these findings mean in simple terms
+   - Avoid medical jargon or explain it clearly
+
+2. **Risk Interpretation** (1-2 sentences)
+   - What does this risk level mean practically?
+   - Context about similar lesions
+
+3. **Triage Recommendation** (Clear action item)
+   - Choose ONE of these recommendations based on risk:
+     * LOW: "Continue monitoring at home, check monthly for changes"
+     * MEDIUM: "Schedule a dermatologist consultation within 2-4 weeks"
+     * HIGH: "Seek professional evaluation within 1 week"
+     * URGENT: "Contact healthcare provider immediately"
+
+4. **Educational Points** (2-3 bullet points)
+   - Key things to know about this type of finding
+   - What to watch for going forward
+
+5. **Questions for Doctor** (3-4 questions)
+   - Helpful questions the patient should ask during consultation
+   - Specific to these findings
+
+**CRITICAL REMINDER:** End with a clear disclaimer that this is screening, not diagnosis.
+
+Please respond in a warm, professional tone that empowers the patient while being medically responsible.
+"""
+
+
 class MedGemmaClient:
     """
     Client for Med-Gemma medical AI model
@@ -27,7 +79,7 @@ class MedGemmaClient:
         try:
             self.model = genai.GenerativeModel('gemini-pro')
         except Exception as e:
-            print(f"Warning: Could not load Med-Gemma, using fallback: {e}")
+            logger.warning("Could not load Med-Gemma, using fallback: %s", e)
             self.model = genai.GenerativeModel('gemini-pro')
         
         # Configure generation settings
@@ -45,6 +97,15 @@ class MedGemmaClient:
             {"category": "HARM_CATEGORY_SEXUALLY_EXPLICIT", "threshold": "BLOCK_NONE"},
             {"category": "HARM_CATEGORY_DANGEROUS_CONTENT", "threshold": "BLOCK_NONE"},
         ]
+        
+        # LRU cache of model responses keyed by prompt (identical findings -> identical prompt)
+        self._response_cache = OrderedDict()
+        self._cache_lock = threading.Lock()
+        
+        # Fail fast to the fallback response while the API is down
+        self._breaker = CircuitBreaker(
+            "Med-Gemma", Config.CIRCUIT_BREAKER_FAILURES, Config.CIRCUIT_BREAKER_COOLDOWN_SECONDS
+        )
     
     def analyze_skin_lesion(self, abcde_results: Dict, user_context: Optional[Dict] = None) -> Dict:
         """
@@ -60,8 +121,11 @@ class MedGemmaClient:
         prompt = self._build_prompt(abcde_results, user_context)
         
         try:
-            # Generate response with retry logic
-            response = self._generate_with_retry(prompt)
+            # Reuse the earlier answer for identical findings, else generate with retry logic
+            response = self._get_cached_response(prompt)
+            if response is None:
+                response = self._breaker.call(self._generate_with_timeout, prompt)
+                self._cache_response(prompt, response)
             
             # Parse response
             result = self._parse_response(response, abcde_results)
@@ -89,7 +153,7 @@ class MedGemmaClient:
         risk_level = abcde_results["risk_level"]
         visual_features = abcde_results["visual_features"]
         
-        prompt = f"""You are a dermatology education assistant AI. Provide clear, empathetic guidance based on the following skin lesion screening data.
+        parts = [f"""You are a dermatology education assistant AI. Provide clear, empathetic guidance based on the following skin lesion screening data.
 
 **IMPORTANT CONTEXT:**
 - This is a preliminary screening tool, NOT a medical diagnosis
@@ -118,52 +182,60 @@ Total Risk Score: {total_score}/11 ({risk_level} RISK)
 
 5. **Evolution** (Score: {scores['evolution']}/3)
    - {descriptions['evolution']}
-"""
+"""]
         
         # Add user context if available
         if user_context:
-            prompt += f"\n**PATIENT CONTEXT:**\n"
+            parts.append("\n**PATIENT CONTEXT:**\n")
             if 'age' in user_context:
-                prompt += f"- Age: {user_context['age']}\n"
+                parts.append(f"- Age: {user_context['age']}\n")
             if 'skin_type' in user_context:
-                prompt += f"- Skin type: {user_context['skin_type']}\n"
+                parts.append(f"- Skin type: {user_context['skin_type']}\n")
             if 'family_history' in user_context:
-                prompt += f"- Family history: {user_context['family_history']}\n"
+                parts.append(f"- Family history: {user_context['family_history']}\n")
         
-        prompt += """
-
-**YOUR TASK:**
-Please provide a structured response with the following sections:
-
-1. **Plain Language Explanation** (2-3 sentences)
-   - Explain what these findings mean in simple terms
-   - Avoid medical jargon or explain it clearly
-
-2. **Risk Interpretation** (1-2 sentences)
-   - What does this risk level mean practically?
-   - Context about similar lesions
-
-3. **Triage Recommendation** (Clear action item)
-   - Choose ONE of these recommendations based on risk:
-     * LOW: "Continue monitoring at home, check monthly for changes"
-     * MEDIUM: "Schedule a dermatologist consultation within 2-4 weeks"
-     * HIGH: "Seek professional evaluation within 1 week"
-     * URGENT: "Contact healthcare provider immediately"
-
-4. **Educational Points** (2-3 bullet points)
-   - Key things to know about this type of finding
-   - What to watch for going forward
-
-5. **Questions for Doctor** (3-4 questions)
-   - Helpful questions the patient should ask during consultation
-   - Specific to these findings
-
-**CRITICAL REMINDER:** End with a clear disclaimer that this is screening, not diagnosis.
-
-Please respond in a warm, professional tone that empowers the patient while being medically responsible.
-"""
+        parts.append(PROMPT_TASK_INSTRUCTIONS)
+        
+        return "".join(parts)
+    
+    def _get_cached_response(self, prompt: str) -> Optional[str]:
+        """Return cached response text for prompt, or None"""
+        with self._cache_lock:
+            response = self._response_cache.get(prompt)
+            if response is not None:
+                self._response_cache.move_to_end(prompt)
+            return response
+    
+    def _cache_response(self, prompt: str, response: str):
+        """Store response text, evicting the least recently used entry when full"""
+        with self._cache_lock:
+            self._response_cache[prompt] = response
+            self._response_cache.move_to_end(prompt)
+            while len(self._response_cache) > Config.MEDGEMMA_CACHE_SIZE:
+                self._response_cache.popitem(last=False)
+    
+    def _generate_with_timeout(self, prompt: str) -> str:
+        """
+        Generate with retries, giving up after Config.MEDGEMMA_TIMEOUT_SECONDS
         
-        return prompt
+        Args:
+            prompt: Input prompt
+            
+        Returns:
+            Generated response text
+            
+        Raises:
+            TimeoutError: If generation did not finish in time
+        """
+        future = _GENERATION_POOL.submit(self._generate_with_retry, prompt)
+        try:
+            return future.result(timeout=Config.MEDGEMMA_TIMEOUT_SECONDS)
+        except FutureTimeoutError:
+            # Don't leave abandoned generations queued ahead of new callers
+            future.cancel()
+            raise TimeoutError(
+                f"no response within {Config.MEDGEMMA_TIMEOUT_SECONDS:g}s"
+            ) from None
     
     def _generate_with_retry(self, prompt: str, max_retries: int = 3) -> str:
         """
@@ -176,6 +248,7 @@ Please respond in a warm, professional tone that empowers the patient while bein
         Returns:
             Generated response text
         """
+        start = time.monotonic()
         for attempt in range(max_retries):
             try:
                 response = self.model.generate_content(
@@ -187,9 +260,12 @@ Please respond in a warm, professional tone that empowers the patient while bein
                 return response.text
                 
             except Exception as e:
-                if attempt < max_retries - 1:
-                    wait_time = 2 ** attempt  # Exponential backoff
-                    print(f"API call failed (attempt {attempt + 1}/{max_retries}), retrying in {wait_time}s...")
+                # Jittered so concurrent sessions don't retry a struggling API in lockstep
+                wait_time = random.uniform(0, RETRY_BASE_SECONDS * 2 ** attempt)
+                elapsed = time.monotonic() - start
+                if attempt < max_retries - 1 and elapsed + wait_time < RETRY_MAX_ELAPSED_SECONDS:
+                    logger.warning("API call failed (attempt %d/%d), retrying in %.1fs...",
+                                   attempt + 1, max_retries, wait_time)
                     time.sleep(wait_time)
                 else:
                     raise e
@@ -7,8 +7,13 @@ from typing import Dict, List, Optional
 import google.generativeai as genai
 from datetime import datetime
 from utils.config import Config
+from utils.circuit_breaker import CircuitBreaker
 import re
 import json
+import logging
+
+
+logger = logging.getLogger(__name__)
 
 
 class SymptomAnalyzer:
@@ -29,23 +34,23 @@ class SymptomAnalyzer:
             # Primary: Gemini 2.5 Flash (STABLE - June 2025 GA)
             # Best for production: predictable latency, proven reliability
             self.model = genai.GenerativeModel('gemini-2.5-flash')
-            print("Using Gemini 2.5 Flash (stable)")
+            logger.info("Using Gemini 2.5 Flash (stable)")
         except Exception as e:
-            print(f"Gemini 2.5 Flash unavailable: {e}, trying 3.0 Flash...")
+            logger.warning("Gemini 2.5 Flash unavailable: %s, trying 3.0 Flash...", e)
             try:
                 # Fallback 1: Gemini 3.0 Flash (LATEST - Dec 2025 preview)
                 # Frontier intelligence, fastest, but newer/experimental
                 self.model = genai.GenerativeModel('gemini-3-flash')
-                print("Using Gemini 3.0 Flash (latest experimental)")
+                logger.info("Using Gemini 3.0 Flash (latest experimental)")
             except Exception as e2:
-                print(f"Gemini 3.0 Flash unavailable: {e2}, trying legacy...")
+                logger.warning("Gemini 3.0 Flash unavailable: %s, trying legacy...", e2)
                 try:
                     # Fallback 2: Gemini 1.5 Flash (older stable)
                     self.model = genai.GenerativeModel('gemini-1.5-flash')
-                    print("Using Gemini 1.5 Flash (legacy)")
+                    logger.info("Using Gemini 1.5 Flash (legacy)")
                 except Exception as e3:
                     # Last resort: basic gemini
-                    print(f"All modern models unavailable: {e3}, using basic gemini-pro")
+                    logger.warning("All modern models unavailable: %s, using basic gemini-pro", e3)
                     self.model = genai.GenerativeModel('gemini-pro')
         
         # Configure for medical documentation
@@ -64,6 +69,11 @@ class SymptomAnalyzer:
             {"category": "HARM_CATEGORY_SEXUALLY_EXPLICIT", "threshold": "BLOCK_NONE"},
             {"category": "HARM_CATEGORY_DANGEROUS_CONTENT", "threshold": "BLOCK_NONE"},
         ]
+        
+        # Fail fast to the fallback SOAP note while the API is down
+        self._breaker = CircuitBreaker(
+            "Symptom analysis", Config.CIRCUIT_BREAKER_FAILURES, Config.CIRCUIT_BREAKER_COOLDOWN_SECONDS
+        )
     
     def analyze_symptoms(self, symptoms_text: str, patient_context: Optional[Dict] = None) -> Dict:
         """
@@ -81,7 +91,8 @@ class SymptomAnalyzer:
         
         try:
             # Generate SOAP note
-            response = self.model.generate_content(
+            response = self._breaker.call(
+                self.model.generate_content,
                 prompt,
                 generation_config=self.generation_config,
                 safety_settings=self.safety_settings
@@ -0,0 +1,73 @@
+"""
+Micro-benchmark for SOAP PDF backends
+Times fpdf2 vs ReportLab on synthetic reports of growing length and suggests
+a REPORTLAB_MIN_CHARS value for utils/pdf_generator.py
+
+Usage (from the repository root):
+    python scripts/benchmark_pdf_backends.py [--repeat 5]
+"""
+import argparse
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from utils.pdf_generator import PDF_BACKENDS, _report_char_count  # noqa: E402
+
+
+SENTENCE = ("Patient reports an itchy, slightly raised erythematous patch on the left forearm "
+            "that has been present for approximately two weeks without discharge. ")
+
+
+def make_consultation(paragraphs: int) -> dict:
+    """Synthetic consultation whose SOAP sections hold `paragraphs` paragraphs each"""
+    text = "\n\n".join(SENTENCE * 4 for _ in range(paragraphs))
+    return {
+        "raw_input": SENTENCE,
+        "triage": {"level": "ROUTINE", "color": "yellow", "recommendation": "Consult a dermatologist"},
+        "soap_note": {"subjective": text, "objective": text, "assessment": text, "plan": text},
+        "medical_entities": {"red_flags": ["rapid growth", "bleeding"]},
+    }
+
+
+def time_backend(name: str, consultation: dict, repeat: int) -> float:
+    """Best-of-N render time in milliseconds"""
+    backend = PDF_BACKENDS[name]()
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        backend.render(consultation)
+        best = min(best, time.perf_counter() - start)
+    return best * 1000
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--repeat", type=int, default=5, help="runs per size (best is kept)")
+    args = parser.parse_args()
+
+    try:
+        import reportlab  # noqa: F401
+    except ImportError:
+        sys.exit("reportlab is not installed - pip install reportlab")
+
+    crossover = None
+    print(f"{'chars':>8} {'fpdf2 ms':>10} {'reportlab ms':>13}")
+    for paragraphs in (1, 5, 10, 25, 50, 100, 200):
+        consultation = make_consultation(paragraphs)
+        chars = _report_char_count(consultation)
+        fpdf2_ms = time_backend("fpdf2", consultation, args.repeat)
+        reportlab_ms = time_backend("reportlab", consultation, args.repeat)
+        print(f"{chars:>8} {fpdf2_ms:>10.1f} {reportlab_ms:>13.1f}")
+        if crossover is None and reportlab_ms < fpdf2_ms:
+            crossover = chars
+
+    if crossover is None:
+        print("\nfpdf2 was faster at every size - keep backend='fpdf2'")
+    else:
+        print(f"\nReportLab faster from ~{crossover} chars: set REPORTLAB_MIN_CHARS = {crossover}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,117 @@
+"""
+Tests for the circuit breaker half-open transitions
+"""
+import threading
+import time
+
+import pytest
+
+from utils.circuit_breaker import CircuitBreaker, CircuitOpenError
+
+
+COOLDOWN = 0.05
+
+
+def fail():
+    raise RuntimeError("dependency down")
+
+
+def open_breaker(breaker: CircuitBreaker):
+    for _ in range(breaker.failure_threshold):
+        with pytest.raises(RuntimeError):
+            breaker.call(fail)
+
+
+def test_opens_after_threshold_and_rejects_during_cooldown():
+    breaker = CircuitBreaker("test", failure_threshold=2, cooldown_seconds=COOLDOWN)
+    open_breaker(breaker)
+    with pytest.raises(CircuitOpenError):
+        breaker.call(lambda: "ok")
+
+
+def test_successful_trial_closes_circuit():
+    breaker = CircuitBreaker("test", failure_threshold=2, cooldown_seconds=COOLDOWN)
+    open_breaker(breaker)
+    time.sleep(COOLDOWN * 1.5)
+    assert breaker.call(lambda: "trial") == "trial"
+    assert breaker.call(lambda: "next") == "next"
+
+
+def test_failed_trial_reopens_circuit():
+    breaker = CircuitBreaker("test", failure_threshold=2, cooldown_seconds=COOLDOWN)
+    open_breaker(breaker)
+    time.sleep(COOLDOWN * 1.5)
+    with pytest.raises(RuntimeError):
+        breaker.call(fail)
+    with pytest.raises(CircuitOpenError):
+        breaker.call(lambda: "ok")
+
+
+def test_only_one_trial_while_half_open():
+    breaker = CircuitBreaker("test", failure_threshold=2, cooldown_seconds=COOLDOWN)
+    open_breaker(breaker)
+    time.sleep(COOLDOWN * 1.5)
+
+    release = threading.Event()
+    trial_started = threading.Event()
+
+    def slow_trial():
+        trial_started.set()
+        release.wait(1)
+        return "trial"
+
+    results = []
+    trial = threading.Thread(target=lambda: results.append(breaker.call(slow_trial)))
+    trial.start()
+    trial_started.wait(1)
+    with pytest.raises(CircuitOpenError):
+        breaker.call(lambda: "concurrent")
+    release.set()
+    trial.join()
+    assert results == ["trial"]
+
+
+def test_stale_call_does_not_decide_half_open_outcome():
+    breaker = CircuitBreaker("test", failure_threshold=2, cooldown_seconds=COOLDOWN)
+    release_stale = threading.Event()
+    stale_started = threading.Event()
+
+    def slow_failure():
+        stale_started.set()
+        release_stale.wait(1)
+        raise RuntimeError("late failure")
+
+    # Slow call starts while the circuit is closed
+    def run_stale():
+        with pytest.raises(RuntimeError):
+            breaker.call(slow_failure)
+    stale = threading.Thread(target=run_stale)
+    stale.start()
+    stale_started.wait(1)
+
+    open_breaker(breaker)
+    time.sleep(COOLDOWN * 1.5)
+
+    release_trial = threading.Event()
+    trial_started = threading.Event()
+
+    def slow_success():
+        trial_started.set()
+        release_trial.wait(1)
+        return "trial"
+
+    results = []
+    trial = threading.Thread(target=lambda: results.append(breaker.call(slow_success)))
+    trial.start()
+    trial_started.wait(1)
+
+    # The stale call fails mid-trial: the trial slot must stay taken
+    release_stale.set()
+    stale.join()
+    with pytest.raises(CircuitOpenError):
+        breaker.call(lambda: "concurrent")
+
+    release_trial.set()
+    trial.join()
+    assert results == ["trial"]
+    assert breaker.call(lambda: "closed") == "closed"
@@ -0,0 +1,81 @@
+"""
+Circuit breaker for remote model calls
+Fails fast while a dependency is down instead of waiting out every retry
+"""
+import threading
+import time
+from typing import Callable, Optional
+
+
+class CircuitOpenError(Exception):
+    """Raised instead of calling a dependency whose circuit is open"""
+
+
+class CircuitBreaker:
+    """
+    Consecutive-failure circuit breaker (thread-safe, shared across sessions)
+    
+    After `failure_threshold` failed calls in a row the circuit opens and calls
+    fail immediately with CircuitOpenError. Once `cooldown_seconds` have passed,
+    one trial call is let through: success closes the circuit, failure re-opens it.
+    """
+    
+    def __init__(self, name: str, failure_threshold: int, cooldown_seconds: float):
+        self.name = name
+        self.failure_threshold = failure_threshold
+        self.cooldown_seconds = cooldown_seconds
+        self._failures = 0
+        self._opened_at: Optional[float] = None
+        self._trial_in_flight = False
+        self._lock = threading.Lock()
+    
+    def call(self, func: Callable, *args, **kwargs):
+        """
+        Call func through the breaker
+        
+        Args:
+            func: Remote call to protect
+            *args, **kwargs: Passed through to func
+        
+        Returns:
+            Whatever func returns
+        
+        Raises:
+            CircuitOpenError: If the circuit is open, cooling down or running its trial call
+        """
+        is_trial = False
+        with self._lock:
+            if self._trial_in_flight:
+                raise CircuitOpenError(f"{self.name} temporarily unavailable")
+            if self._opened_at is not None:
+                if time.monotonic() - self._opened_at < self.cooldown_seconds:
+                    raise CircuitOpenError(f"{self.name} temporarily unavailable")
+                # Cooldown elapsed - only this call goes through, as the trial
+                self._trial_in_flight = True
+                is_trial = True
+        
+        try:
+            result = func(*args, **kwargs)
+        except Exception:
+            with self._lock:
+                if is_trial:
+                    # Trial failed - re-open for another cooldown
+                    self._trial_in_flight = False
+                    self._opened_at = time.monotonic()
+                elif self._opened_at is None:
+                    # Only count failures while closed; calls that started before the
+                    # circuit opened must not decide the half-open outcome
+                    self._failures += 1
+                    if self._failures >= self.failure_threshold:
+                        self._opened_at = time.monotonic()
+            raise
+        
+        with self._lock:
+            if is_trial:
+                # Trial succeeded - close the circuit
+                self._trial_in_flight = False
+                self._opened_at = None
+                self._failures = 0
+            elif self._opened_at is None:
+                self._failures = 0
+        return result
@@ -20,15 +20,24 @@ class Config:
     # Model Configuration
     MEDGEMMA_MODEL = os.getenv("MEDGEMMA_MODEL", "medgemma-7b")
     VISION_MODEL = os.getenv("VISION_MODEL", "paligemma-3b")
+    MEDGEMMA_CACHE_SIZE = int(os.getenv("MEDGEMMA_CACHE_SIZE", "256"))  # Cached responses (by prompt)
+    CIRCUIT_BREAKER_FAILURES = 5  # Consecutive failed model calls before failing fast
+    CIRCUIT_BREAKER_COOLDOWN_SECONDS = 30
+    MEDGEMMA_TIMEOUT_SECONDS = float(os.getenv("MEDGEMMA_TIMEOUT_SECONDS", "30"))  # Whole call incl. retries
     
     # Application Settings
     DEBUG_MODE = os.getenv("DEBUG_MODE", "False").lower() == "true"
+    LOG_LEVEL = os.getenv("LOG_LEVEL", "INFO" if DEBUG_MODE else "WARNING").upper()
     MAX_UPLOAD_SIZE_MB = int(os.getenv("MAX_UPLOAD_SIZE_MB", "10"))
+    MAX_IMAGE_PIXELS = int(os.getenv("MAX_IMAGE_PIXELS", "40000000"))  # ~40MP, rejects decompression bombs
     SUPPORTED_FORMATS = os.getenv("SUPPORTED_FORMATS", "jpg,jpeg,png").split(",")
     
     # Image Processing
     TARGET_IMAGE_SIZE = (512, 512)
     MIN_IMAGE_SIZE = (100, 100)
+    ANALYSIS_MAX_DIMENSION = 1024  # ABCDE analysis downscales larger photos (long side, px)
+    ABCDE_CACHE_SIZE = 32  # Cached analyses of identical photos (each holds a lesion mask)
+    DISPLAY_MAX_DIMENSION = 800  # Timeline gallery decodes stored photos at this size (long side, px)
     
     # ABCDE Thresholds
     RISK_THRESHOLDS = {
@@ -40,6 +49,7 @@ class Config:
     # Timeline Settings
     ALERT_SIZE_CHANGE_THRESHOLD = 0.20  # 20% size increase
     ALERT_TIMEFRAME_DAYS = 30
+    TIMELINE_JPEG_QUALITY = 85  # Visually lossless for tracking photos, ~half the size of 95
     
     # Paths
     UPLOAD_DIR = "uploads"
@@ -38,6 +38,10 @@ def validate_image(image_file) -> Tuple[bool, str]:
         if image.format and image.format.lower() not in supported_formats:
             return False, f"Unsupported format. Please use: JPG, JPEG, PNG"
         
+        # Check pixel count before anything decodes it (Image.open only reads the header)
+        if image.size[0] * image.size[1] > Config.MAX_IMAGE_PIXELS:
+            return False, f"Image resolution too large. Maximum: {Config.MAX_IMAGE_PIXELS // 1_000_000} megapixels"
+        
         # Check dimensions
         if image.size[0] < Config.MIN_IMAGE_SIZE[0] or image.size[1] < Config.MIN_IMAGE_SIZE[1]:
             return False, f"Image too small. Minimum size: {Config.MIN_IMAGE_SIZE}"
@@ -56,6 +60,24 @@ def validate_image(image_file) -> Tuple[bool, str]:
         return False, f"Error reading image: {str(e)}"
 
 
+def load_display_image(image_path: str, max_size: int = None) -> Image.Image:
+    """
+    Open a stored photo for on-screen display, decoding large JPEGs at reduced scale
+    
+    Args:
+        image_path: Path to the stored image
+        max_size: Longest side needed for display (defaults to Config.DISPLAY_MAX_DIMENSION)
+        
+    Returns:
+        PIL Image no smaller than needed for display
+    """
+    max_size = max_size or Config.DISPLAY_MAX_DIMENSION
+    image = Image.open(image_path)
+    # JPEG only: libjpeg downsamples during the IDCT (1/2, 1/4, 1/8), never below max_size
+    image.draft('RGB', (max_size, max_size))
+    return image
+
+
 def preprocess_image(image: Image.Image) -> np.ndarray:
     """
     Preprocess image for analysis
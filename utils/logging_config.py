@@ -0,0 +1,53 @@
+"""
+Logging setup for DermaCheck AI
+Routes records through a queue so formatting and stream writes happen off the
+Streamlit script threads
+"""
+import atexit
+import logging
+import logging.handlers
+import queue
+from typing import Optional
+
+from utils.config import Config
+
+LOG_FORMAT = "%(asctime)s %(levelname)s %(name)s: %(message)s"
+
+# Started once per process - Streamlit re-executes the app script on every
+# interaction, but this module stays imported
+_listener: Optional[logging.handlers.QueueListener] = None
+
+
+def configure_logging(level: Optional[str] = None) -> None:
+    """
+    Attach a QueueHandler to the root logger, drained by a background QueueListener
+    
+    Args:
+        level: Log level name (defaults to Config.LOG_LEVEL)
+    """
+    global _listener
+    if _listener is not None:
+        return
+    
+    stream_handler = logging.StreamHandler()
+    stream_handler.setFormatter(logging.Formatter(LOG_FORMAT))
+    
+    # An unknown level name (e.g. a typo in LOG_LEVEL) falls back to WARNING
+    # instead of failing the app at import
+    level_name = (level or Config.LOG_LEVEL).upper()
+    numeric_level = logging.getLevelName(level_name)
+    unknown_level = not isinstance(numeric_level, int)
+    if unknown_level:
+        numeric_level = logging.WARNING
+    
+    log_queue = queue.SimpleQueue()
+    root = logging.getLogger()
+    root.setLevel(numeric_level)
+    root.addHandler(logging.handlers.QueueHandler(log_queue))
+    
+    _listener = logging.handlers.QueueListener(log_queue, stream_handler, respect_handler_level=True)
+    _listener.start()
+    atexit.register(_listener.stop)
+    
+    if unknown_level:
+        logging.getLogger(__name__).warning("Unknown log level %r, using WARNING", level_name)
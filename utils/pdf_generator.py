@@ -5,11 +5,53 @@ v2.1.1: Fixed emoji encoding for latin-1 font compatibility
 """
 from fpdf import FPDF
 from datetime import datetime
-from typing import Dict, Optional
+from typing import BinaryIO, Dict, List, Optional, Protocol
+from concurrent.futures import ProcessPoolExecutor
+from functools import partial
+import importlib.util
+import io
+import multiprocessing
 import os
 import re
 
 
+# Static report text, identical on every PDF
+FOOTER_DISCLAIMER = (
+    'IMPORTANT: This is AI-generated assistance, not a medical diagnosis. '
+    'Always consult a qualified healthcare professional.'
+)
+
+MEDICAL_DISCLAIMER = (
+    'This document is generated by artificial intelligence for informational and organizational '
+    'purposes only. It is NOT a substitute for professional medical advice, diagnosis, or treatment. '
+    'Always seek the advice of your physician or other qualified health provider with any questions '
+    'you may have regarding a medical condition. Never disregard professional medical advice or delay '
+    'in seeking it because of something you have read in this document.'
+)
+
+# Triage badge colors (RGB), shared by the fpdf2 and ReportLab backends
+TRIAGE_COLORS = {
+    'red': (220, 38, 38),
+    'orange': (249, 115, 22),
+    'yellow': (234, 179, 8),
+    'green': (34, 197, 94)
+}
+
+
+# Emoji blocks matched per code point, so composite emoji (ZWJ sequences,
+# skin-tone modifiers, variation selectors, flags) are removed in one pass
+_EMOJI_RE = re.compile(
+    "["
+    "\U0001F000-\U0001FFFF"  # all SMP emoji/pictograph blocks (incl. flags, skin tones)
+    "\u2600-\u27BF"          # misc symbols & dingbats
+    "\u2190-\u21FF"          # arrows
+    "\u2300-\u23FF"          # misc technical (watch, hourglass, ...)
+    "\uFE00-\uFE0F"          # variation selectors (VS16)
+    "\u200D"                 # zero-width joiner
+    "]+"
+)
+
+
 def sanitize_for_pdf(text: str) -> str:
     """
     Remove emoji and non-latin characters for PDF compatibility
@@ -29,30 +71,12 @@ def sanitize_for_pdf(text: str) -> str:
     if not text:
         return text
     
-    # Method 1: Remove emoji using regex pattern
-    # Covers most common emoji ranges
-    emoji_pattern = re.compile(
-        "["
-        "\U0001F600-\U0001F64F"  # emoticons
-        "\U0001F300-\U0001F5FF"  # symbols & pictographs
-        "\U0001F680-\U0001F6FF"  # transport & map symbols
-        "\U0001F1E0-\U0001F1FF"  # flags (iOS)
-        "\U00002702-\U000027B0"  # dingbats
-        "\U000024C2-\U0001F251"
-        "\U0001F900-\U0001F9FF"  # supplemental symbols
-        "\U0001FA00-\U0001FA6F"  # extended symbols
-        "]+",
-        flags=re.UNICODE
-    )
-    
-    text = emoji_pattern.sub('', text)
+    # Method 1: Remove emoji (incl. ZWJ sequences, skin tones, VS16)
+    text = _EMOJI_RE.sub('', text)
     
     # Method 2: Encode to latin-1 and ignore errors
-    # This catches any remaining non-latin characters
-    try:
-        text = text.encode('latin-1', 'ignore').decode('latin-1')
-    except:
-        pass
+    # This catches any remaining non-latin characters (cannot raise for str input)
+    text = text.encode('latin-1', 'ignore').decode('latin-1')
     
     return text.strip()
 
@@ -69,12 +93,12 @@ class SOAPReportGenerator(FPDF):
     def header(self):
         """Custom header with DermaCheck branding"""
         # Logo/Title - NO EMOJI
-        self.set_font('Arial', 'B', 20)
+        self.set_font('Helvetica', 'B', 20)
         self.set_text_color(20, 184, 166)  # Medical Teal
         self.cell(0, 10, 'DermaCheck AI', 0, 1, 'C')
         
         # Subtitle
-        self.set_font('Arial', 'I', 10)
+        self.set_font('Helvetica', 'I', 10)
         self.set_text_color(100, 100, 100)
         self.cell(0, 5, 'AI Pre-Consultation Medical Assistant', 0, 1, 'C')
         self.ln(5)
@@ -82,7 +106,7 @@ class SOAPReportGenerator(FPDF):
     def footer(self):
         """Custom footer with page numbers and disclaimer"""
         self.set_y(-20)
-        self.set_font('Arial', 'I', 8)
+        self.set_font('Helvetica', 'I', 8)
         self.set_text_color(128, 128, 128)
         
         # Page number
@@ -90,14 +114,24 @@ class SOAPReportGenerator(FPDF):
         
         # Disclaimer
         self.set_text_color(200, 0, 0)  # Red warning
-        self.set_font('Arial', 'B', 8)
-        self.multi_cell(0, 4, 'IMPORTANT: This is AI-generated assistance, not a medical diagnosis. '
-                              'Always consult a qualified healthcare professional.', 0, 'C')
+        self.set_font('Helvetica', 'B', 8)
+        self.multi_cell(0, 4, FOOTER_DISCLAIMER, 0, 'C')
+        
+    def add_medical_disclaimer(self):
+        """Add the closing medical disclaimer box (same text on every report)"""
+        self.ln(10)
+        self.set_fill_color(255, 243, 205)  # Light yellow
+        self.rect(10, self.get_y(), 190, 30, 'F')
+        self.set_font('Helvetica', 'B', 11)
+        self.set_text_color(146, 64, 14)  # Dark orange
+        self.cell(0, 8, 'IMPORTANT MEDICAL DISCLAIMER', 0, 1, 'C')
+        self.set_font('Helvetica', '', 9)
+        self.multi_cell(0, 4, MEDICAL_DISCLAIMER, 0, 'C')
         
     def add_section_title(self, title: str, color_r: int = 59, color_g: int = 130, color_b: int = 246):
         """Add a styled section title"""
         title = sanitize_for_pdf(title)  # Clean text
-        self.set_font('Arial', 'B', 14)
+        self.set_font('Helvetica', 'B', 14)
         self.set_text_color(color_r, color_g, color_b)
         self.cell(0, 10, title, 0, 1, 'L')
         self.set_text_color(0, 0, 0)
@@ -113,11 +147,11 @@ class SOAPReportGenerator(FPDF):
         self.rect(self.get_x(), self.get_y(), 190, 10, 'F')
         
         # Label
-        self.set_font('Arial', 'B', 10)
+        self.set_font('Helvetica', 'B', 10)
         self.cell(50, 10, label + ':', 0, 0, 'L')
         
         # Value
-        self.set_font('Arial', '', 10)
+        self.set_font('Helvetica', '', 10)
         self.cell(0, 10, value, 0, 1, 'L')
         self.ln(2)
         
@@ -126,23 +160,15 @@ class SOAPReportGenerator(FPDF):
         level = sanitize_for_pdf(level)  # Clean text
         recommendation = sanitize_for_pdf(recommendation)  # Clean text
         
-        # Map colors
-        color_map = {
-            'red': (220, 38, 38),
-            'orange': (249, 115, 22),
-            'yellow': (234, 179, 8),
-            'green': (34, 197, 94)
-        }
-        
-        rgb = color_map.get(color, (128, 128, 128))
+        rgb = TRIAGE_COLORS.get(color, (128, 128, 128))
         
         # Title - NO EMOJI
-        self.set_font('Arial', 'B', 12)
+        self.set_font('Helvetica', 'B', 12)
         self.set_text_color(rgb[0], rgb[1], rgb[2])
         self.cell(0, 8, f'TRIAGE PRIORITY: {level}', 0, 1, 'L')
         
         # Recommendation
-        self.set_font('Arial', '', 10)
+        self.set_font('Helvetica', '', 10)
         self.set_text_color(0, 0, 0)
         self.multi_cell(0, 5, f'Recommendation: {recommendation}', 0, 'L')
         self.ln(5)
@@ -156,12 +182,12 @@ class SOAPReportGenerator(FPDF):
         # Section header with colored bar
         self.set_fill_color(20, 184, 166)  # Medical teal
         self.set_text_color(255, 255, 255)
-        self.set_font('Arial', 'B', 12)
+        self.set_font('Helvetica', 'B', 12)
         self.cell(0, 8, f' {section_letter} - {section_name.upper()} ', 0, 1, 'L', True)
         
         # Content
         self.set_text_color(0, 0, 0)
-        self.set_font('Arial', '', 10)
+        self.set_font('Helvetica', '', 10)
         self.ln(2)
         
         # Clean and format content
@@ -178,14 +204,14 @@ class SOAPReportGenerator(FPDF):
         self.ln(5)
 
 
-def generate_soap_pdf(
+def _build_soap_pdf(
     consultation_data: Dict,
     patient_name: Optional[str] = None,
     patient_age: Optional[int] = None,
     patient_gender: Optional[str] = None
-) -> bytes:
+) -> SOAPReportGenerator:
     """
-    Generate professional PDF from SOAP consultation result
+    Lay out the SOAP report document (shared by the bytes and stream outputs)
     
     Args:
         consultation_data: Dictionary with SOAP note and triage info
@@ -194,13 +220,13 @@ def generate_soap_pdf(
         patient_gender: Optional patient gender
         
     Returns:
-        PDF content as bytes
+        Fully laid out SOAPReportGenerator, ready for output()
     """
     pdf = SOAPReportGenerator()
     pdf.add_page()
     
     # Document Info
-    pdf.set_font('Arial', 'B', 10)
+    pdf.set_font('Helvetica', 'B', 10)
     pdf.set_text_color(100, 100, 100)
     pdf.cell(0, 5, f'Generated: {datetime.now().strftime("%B %d, %Y at %H:%M")}', 0, 1, 'R')
     pdf.ln(5)
@@ -220,7 +246,7 @@ def generate_soap_pdf(
     
     # Chief Complaint (from raw input)
     pdf.add_section_title('Chief Complaint', 59, 130, 246)
-    pdf.set_font('Arial', '', 10)
+    pdf.set_font('Helvetica', '', 10)
     complaint_text = sanitize_for_pdf(consultation_data.get('raw_input', 'No complaint provided'))
     pdf.multi_cell(0, 5, complaint_text, 0, 'L')
     pdf.ln(5)
@@ -255,50 +281,187 @@ def generate_soap_pdf(
     # Medical Entities (if significant)
     entities = consultation_data.get('medical_entities', {})
     if entities.get('red_flags'):
+        clean_flags = [sanitize_for_pdf(flag.title()) for flag in entities['red_flags']]
         pdf.ln(5)
         pdf.set_fill_color(254, 226, 226)  # Light red
-        pdf.rect(pdf.get_x(), pdf.get_y(), 190, 8 + len(entities['red_flags']) * 5, 'F')
-        pdf.set_font('Arial', 'B', 11)
+        pdf.rect(pdf.get_x(), pdf.get_y(), 190, 8 + len(clean_flags) * 5, 'F')
+        pdf.set_font('Helvetica', 'B', 11)
         pdf.set_text_color(220, 38, 38)
         pdf.cell(0, 8, 'RED FLAGS DETECTED:', 0, 1, 'L')
-        pdf.set_font('Arial', '', 10)
-        for flag in entities['red_flags']:
-            clean_flag = sanitize_for_pdf(flag.title())
-            pdf.cell(0, 5, f'  - {clean_flag}', 0, 1, 'L')
+        pdf.set_font('Helvetica', '', 10)
+        for clean_flag in clean_flags:
+            pdf.cell(0, 5, '  - ' + clean_flag, 0, 1, 'L')
         pdf.set_text_color(0, 0, 0)
         pdf.ln(3)
     
     # Final Medical Disclaimer (prominent)
-    pdf.ln(10)
-    pdf.set_fill_color(255, 243, 205)  # Light yellow
-    pdf.rect(10, pdf.get_y(), 190, 30, 'F')
-    pdf.set_font('Arial', 'B', 11)
-    pdf.set_text_color(146, 64, 14)  # Dark orange
-    pdf.cell(0, 8, 'IMPORTANT MEDICAL DISCLAIMER', 0, 1, 'C')
-    pdf.set_font('Arial', '', 9)
-    pdf.multi_cell(0, 4, 
-        'This document is generated by artificial intelligence for informational and organizational '
-        'purposes only. It is NOT a substitute for professional medical advice, diagnosis, or treatment. '
-        'Always seek the advice of your physician or other qualified health provider with any questions '
-        'you may have regarding a medical condition. Never disregard professional medical advice or delay '
-        'in seeking it because of something you have read in this document.', 
-        0, 'C')
-    
-    # Return PDF as bytes
-    # fpdf2 v2.x: output(dest='S') returns bytes or bytearray
-    # Streamlit's download_button requires bytes, not bytearray
-    pdf_output = pdf.output(dest='S')
-    
-    # Convert to bytes if needed (handle str, bytes, or bytearray)
-    if isinstance(pdf_output, str):
-        # Old fpdf versions return str
-        return pdf_output.encode('latin-1')
-    elif isinstance(pdf_output, bytearray):
-        # Some fpdf2 versions return bytearray - convert to bytes
-        return bytes(pdf_output)
-    else:
-        # Already bytes
-        return pdf_output
+    pdf.add_medical_disclaimer()
+    
+    return pdf
+
+
+class PDFBackend(Protocol):
+    """Renders a SOAP consultation to PDF (see PDF_BACKENDS)"""
+    
+    def render(self, consultation_data: Dict, patient_name: Optional[str] = None,
+               patient_age: Optional[int] = None, patient_gender: Optional[str] = None) -> bytes:
+        """Render the report and return the PDF bytes"""
+        ...
+    
+    def render_to(self, out: BinaryIO, consultation_data: Dict, patient_name: Optional[str] = None,
+                  patient_age: Optional[int] = None, patient_gender: Optional[str] = None) -> None:
+        """Render the report straight into a writable binary stream"""
+        ...
+
+
+class FPDF2Backend:
+    """Default backend: SOAPReportGenerator (fpdf2)"""
+    
+    def render(self, consultation_data: Dict, patient_name: Optional[str] = None,
+               patient_age: Optional[int] = None, patient_gender: Optional[str] = None) -> bytes:
+        pdf = _build_soap_pdf(consultation_data, patient_name, patient_age, patient_gender)
+        # fpdf2 >= 2.7 returns a bytearray; Streamlit's download_button requires bytes
+        return bytes(pdf.output())
+    
+    def render_to(self, out: BinaryIO, consultation_data: Dict, patient_name: Optional[str] = None,
+                  patient_age: Optional[int] = None, patient_gender: Optional[str] = None) -> None:
+        pdf = _build_soap_pdf(consultation_data, patient_name, patient_age, patient_gender)
+        pdf.output(out)
+
+
+class ReportLabBackend:
+    """ReportLab platypus backend - faster layout for long reports (requires reportlab)"""
+    
+    def render(self, consultation_data: Dict, patient_name: Optional[str] = None,
+               patient_age: Optional[int] = None, patient_gender: Optional[str] = None) -> bytes:
+        buffer = io.BytesIO()
+        self.render_to(buffer, consultation_data, patient_name, patient_age, patient_gender)
+        return buffer.getvalue()
+    
+    def render_to(self, out: BinaryIO, consultation_data: Dict, patient_name: Optional[str] = None,
+                  patient_age: Optional[int] = None, patient_gender: Optional[str] = None) -> None:
+        # Imported lazily: reportlab is optional and only needed for this backend
+        from utils.pdf_reportlab import write_soap_pdf
+        write_soap_pdf(out, consultation_data, patient_name, patient_age, patient_gender)
+
+
+PDF_BACKENDS = {
+    'fpdf2': FPDF2Backend,
+    'reportlab': ReportLabBackend,
+}
+
+# Report size (characters of free text) above which backend='auto' picks ReportLab.
+# Tune with scripts/benchmark_pdf_backends.py on the deployment host.
+REPORTLAB_MIN_CHARS = 20000
+
+
+def _report_char_count(consultation_data: Dict) -> int:
+    """Total free-text characters the report has to lay out"""
+    soap = consultation_data.get('soap_note', {})
+    entities = consultation_data.get('medical_entities', {})
+    return (len(consultation_data.get('raw_input') or '')
+            + sum(len(value or '') for value in soap.values())
+            + sum(len(flag) for flag in entities.get('red_flags') or []))
+
+
+def get_pdf_backend(backend: str = 'fpdf2', consultation_data: Optional[Dict] = None) -> PDFBackend:
+    """
+    Resolve a backend name to a PDFBackend instance
+    
+    Args:
+        backend: 'fpdf2', 'reportlab', or 'auto' (ReportLab for long reports, if installed)
+        consultation_data: Report data, used by 'auto' to measure the text length
+        
+    Returns:
+        PDFBackend instance
+    """
+    if backend == 'auto':
+        backend = 'fpdf2'
+        if consultation_data and _report_char_count(consultation_data) >= REPORTLAB_MIN_CHARS:
+            if importlib.util.find_spec('reportlab') is not None:
+                backend = 'reportlab'
+    
+    if backend not in PDF_BACKENDS:
+        raise ValueError(f"Unknown PDF backend: {backend} (choose from {', '.join(PDF_BACKENDS)}, auto)")
+    
+    return PDF_BACKENDS[backend]()
+
+
+def generate_soap_pdf(
+    consultation_data: Dict,
+    patient_name: Optional[str] = None,
+    patient_age: Optional[int] = None,
+    patient_gender: Optional[str] = None,
+    backend: str = 'fpdf2'
+) -> bytes:
+    """
+    Generate professional PDF from SOAP consultation result
+    
+    Args:
+        consultation_data: Dictionary with SOAP note and triage info
+        patient_name: Optional patient name
+        patient_age: Optional patient age
+        patient_gender: Optional patient gender
+        backend: PDF backend name ('fpdf2', 'reportlab' or 'auto')
+        
+    Returns:
+        PDF content as bytes
+    """
+    return get_pdf_backend(backend, consultation_data).render(
+        consultation_data, patient_name, patient_age, patient_gender
+    )
+
+
+def generate_soap_pdf_stream(
+    out: BinaryIO,
+    consultation_data: Dict,
+    patient_name: Optional[str] = None,
+    patient_age: Optional[int] = None,
+    patient_gender: Optional[str] = None,
+    backend: str = 'fpdf2'
+) -> None:
+    """
+    Generate SOAP PDF directly into a binary stream (file, BytesIO, download buffer)
+    Avoids the extra full-document bytes copy made by generate_soap_pdf
+    
+    Args:
+        out: Writable binary file-like object
+        consultation_data: Dictionary with SOAP note and triage info
+        patient_name: Optional patient name
+        patient_age: Optional patient age
+        patient_gender: Optional patient gender
+        backend: PDF backend name ('fpdf2', 'reportlab' or 'auto')
+    """
+    get_pdf_backend(backend, consultation_data).render_to(
+        out, consultation_data, patient_name, patient_age, patient_gender
+    )
+
+
+def generate_soap_pdfs_batch(items: List[Dict], max_workers: Optional[int] = None,
+                             backend: str = 'fpdf2') -> List[bytes]:
+    """
+    Generate SOAP PDFs for several consultations in parallel
+    Layout is CPU-bound pure Python, so work is spread over processes (not threads)
+    
+    Args:
+        items: List of consultation dictionaries (same shape as generate_soap_pdf input)
+        max_workers: Worker process count (default: os.cpu_count())
+        backend: PDF backend name ('fpdf2', 'reportlab' or 'auto')
+        
+    Returns:
+        List of PDF bytes, in the same order as items
+    """
+    if len(items) <= 1:
+        # Not worth the process startup cost
+        return [generate_soap_pdf(item, backend=backend) for item in items]
+    
+    # Spawn rather than fork: forking the multi-threaded Streamlit process (Tornado,
+    # logging listener, gRPC threads) is unsafe. Spawned workers re-import this
+    # module, so its top-level imports stay light (fpdf only - no PIL/matplotlib)
+    workers = min(max_workers or os.cpu_count() or 1, len(items))
+    with ProcessPoolExecutor(max_workers=workers,
+                             mp_context=multiprocessing.get_context("spawn")) as executor:
+        return list(executor.map(partial(generate_soap_pdf, backend=backend), items))
 
 
 def create_downloadable_soap_pdf(consultation_data: Dict, filename: str = "soap_medical_summary.pdf") -> str:
@@ -312,11 +475,9 @@ def create_downloadable_soap_pdf(consultation_data: Dict, filename: str = "soap_
     Returns:
         Path to created PDF file
     """
-    pdf_bytes = generate_soap_pdf(consultation_data)
-    
-    # Save to temp file
+    # Write straight to the temp file
     output_path = f"/tmp/{filename}"
     with open(output_path, 'wb') as f:
-        f.write(pdf_bytes)
+        generate_soap_pdf_stream(f, consultation_data)
     
     return output_path
@@ -0,0 +1,194 @@
+"""
+ReportLab layout for SOAP Note PDFs
+Alternative to the fpdf2 SOAPReportGenerator for long reports: platypus flows
+paragraphs with ReportLab's C-accelerated text layout (optional dependency)
+"""
+from datetime import datetime
+from typing import BinaryIO, Dict, Optional
+from xml.sax.saxutils import escape
+
+from reportlab.lib import colors
+from reportlab.lib.enums import TA_CENTER, TA_RIGHT
+from reportlab.lib.pagesizes import A4
+from reportlab.lib.styles import ParagraphStyle, getSampleStyleSheet
+from reportlab.lib.units import mm
+from reportlab.platypus import Paragraph, SimpleDocTemplate, Spacer, Table, TableStyle
+
+from utils.pdf_generator import (
+    FOOTER_DISCLAIMER, MEDICAL_DISCLAIMER, TRIAGE_COLORS, sanitize_for_pdf
+)
+
+
+TEAL = colors.Color(20 / 255, 184 / 255, 166 / 255)
+BLUE = colors.Color(59 / 255, 130 / 255, 246 / 255)
+RED = colors.Color(220 / 255, 38 / 255, 38 / 255)
+GREY = colors.Color(100 / 255, 100 / 255, 100 / 255)
+
+
+def _rgb(rgb) -> colors.Color:
+    """Convert an (r, g, b) 0-255 tuple to a ReportLab color"""
+    return colors.Color(rgb[0] / 255, rgb[1] / 255, rgb[2] / 255)
+
+
+def _text(text: Optional[str]) -> str:
+    """Sanitize for latin-1 core fonts and escape for platypus mini-markup"""
+    return escape(sanitize_for_pdf(text) or '').replace('\n', '<br/>')
+
+
+def _build_styles() -> Dict[str, ParagraphStyle]:
+    """Paragraph styles mirroring the fpdf2 report"""
+    base = getSampleStyleSheet()['Normal']
+    return {
+        'title': ParagraphStyle('title', base, fontName='Helvetica-Bold', fontSize=20,
+                                leading=24, alignment=TA_CENTER, textColor=TEAL),
+        'subtitle': ParagraphStyle('subtitle', base, fontName='Helvetica-Oblique', fontSize=10,
+                                   alignment=TA_CENTER, textColor=GREY),
+        'generated': ParagraphStyle('generated', base, fontName='Helvetica-Bold', fontSize=10,
+                                    alignment=TA_RIGHT, textColor=GREY),
+        'section': ParagraphStyle('section', base, fontName='Helvetica-Bold', fontSize=14,
+                                  leading=18, spaceBefore=4, spaceAfter=4),
+        'body': ParagraphStyle('body', base, fontName='Helvetica', fontSize=10, leading=13),
+        'muted': ParagraphStyle('muted', base, fontName='Helvetica', fontSize=10, leading=13,
+                                textColor=GREY),
+        'soap_header': ParagraphStyle('soap_header', base, fontName='Helvetica-Bold', fontSize=12,
+                                      textColor=colors.white),
+        'flag_title': ParagraphStyle('flag_title', base, fontName='Helvetica-Bold', fontSize=11,
+                                     textColor=RED),
+        'disclaimer_title': ParagraphStyle('disclaimer_title', base, fontName='Helvetica-Bold',
+                                           fontSize=11, alignment=TA_CENTER,
+                                           textColor=_rgb((146, 64, 14))),
+        'disclaimer': ParagraphStyle('disclaimer', base, fontName='Helvetica', fontSize=9,
+                                     leading=11, alignment=TA_CENTER,
+                                     textColor=_rgb((146, 64, 14))),
+    }
+
+
+def _boxed(flowables, background: colors.Color) -> Table:
+    """Wrap flowables in a full-width filled box"""
+    table = Table([[flowables]], colWidths=[190 * mm])
+    table.setStyle(TableStyle([
+        ('BACKGROUND', (0, 0), (-1, -1), background),
+        ('LEFTPADDING', (0, 0), (-1, -1), 4),
+        ('RIGHTPADDING', (0, 0), (-1, -1), 4),
+    ]))
+    return table
+
+
+def _draw_footer(canvas, doc):
+    """Page number and short disclaimer at the bottom of every page"""
+    canvas.saveState()
+    canvas.setFont('Helvetica-Oblique', 8)
+    canvas.setFillColor(colors.Color(128 / 255, 128 / 255, 128 / 255))
+    canvas.drawCentredString(A4[0] / 2, 17 * mm, f'Page {doc.page}')
+    canvas.setFont('Helvetica-Bold', 8)
+    canvas.setFillColor(colors.Color(200 / 255, 0, 0))
+    canvas.drawCentredString(A4[0] / 2, 13 * mm, FOOTER_DISCLAIMER)
+    canvas.restoreState()
+
+
+def write_soap_pdf(
+    out: BinaryIO,
+    consultation_data: Dict,
+    patient_name: Optional[str] = None,
+    patient_age: Optional[int] = None,
+    patient_gender: Optional[str] = None
+) -> None:
+    """
+    Lay out the SOAP report with ReportLab platypus and write it to a binary stream
+
+    Args:
+        out: Writable binary file-like object
+        consultation_data: Dictionary with SOAP note and triage info
+        patient_name: Optional patient name
+        patient_age: Optional patient age
+        patient_gender: Optional patient gender
+    """
+    styles = _build_styles()
+    story = [
+        Paragraph('DermaCheck AI', styles['title']),
+        Paragraph('AI Pre-Consultation Medical Assistant', styles['subtitle']),
+        Spacer(1, 5 * mm),
+        Paragraph(f'Generated: {datetime.now().strftime("%B %d, %Y at %H:%M")}', styles['generated']),
+        Spacer(1, 5 * mm),
+    ]
+
+    def section_title(title: str, color: colors.Color):
+        story.append(Paragraph(_text(title), ParagraphStyle('s', styles['section'], textColor=color)))
+
+    # Patient Information Section
+    if patient_name or patient_age or patient_gender:
+        section_title('Patient Information', BLUE)
+        rows = []
+        if patient_name:
+            rows.append(('Patient Name', patient_name))
+        if patient_age:
+            rows.append(('Age', f'{patient_age} years'))
+        if patient_gender and patient_gender != "Select...":
+            rows.append(('Gender', patient_gender))
+        for label, value in rows:
+            story.append(_boxed(
+                Paragraph(f'<b>{_text(label)}:</b> {_text(value)}', styles['body']),
+                colors.Color(240 / 255, 240 / 255, 240 / 255)
+            ))
+            story.append(Spacer(1, 2 * mm))
+        story.append(Spacer(1, 5 * mm))
+
+    # Chief Complaint
+    section_title('Chief Complaint', BLUE)
+    story.append(Paragraph(_text(consultation_data.get('raw_input', 'No complaint provided')),
+                           styles['body']))
+    story.append(Spacer(1, 5 * mm))
+
+    # Triage Priority
+    triage = consultation_data.get('triage', {})
+    if triage:
+        section_title('Triage Assessment', RED)
+        rgb = TRIAGE_COLORS.get(triage.get('color', 'yellow'), (128, 128, 128))
+        story.append(Paragraph(
+            f"TRIAGE PRIORITY: {_text(triage.get('level', 'ROUTINE'))}",
+            ParagraphStyle('triage', styles['body'], fontName='Helvetica-Bold', fontSize=12,
+                           leading=16, textColor=_rgb(rgb))
+        ))
+        story.append(Paragraph(
+            f"Recommendation: {_text(triage.get('recommendation', 'Consult healthcare provider'))}",
+            styles['body']
+        ))
+        story.append(Spacer(1, 10 * mm))
+
+    # SOAP Sections
+    section_title('SOAP Medical Note', TEAL)
+    soap = consultation_data.get('soap_note', {})
+    for letter, name, key in (('S', 'SUBJECTIVE', 'subjective'), ('O', 'OBJECTIVE', 'objective'),
+                              ('A', 'ASSESSMENT', 'assessment'), ('P', 'PLAN', 'plan')):
+        story.append(_boxed(Paragraph(f'{letter} - {name}', styles['soap_header']), TEAL))
+        story.append(Spacer(1, 2 * mm))
+        content = sanitize_for_pdf(soap.get(key, ''))
+        if content:
+            # One Paragraph per line: platypus re-splits a paragraph at every page
+            # break, which turns a single huge paragraph into quadratic work
+            story.extend(Paragraph(escape(line), styles['body']) if line.strip()
+                         else Spacer(1, 13) for line in content.split('\n'))
+        else:
+            story.append(Paragraph('[No data provided]', styles['muted']))
+        story.append(Spacer(1, 5 * mm))
+
+    # Red flags
+    entities = consultation_data.get('medical_entities', {})
+    if entities.get('red_flags'):
+        flags = [Paragraph('RED FLAGS DETECTED:', styles['flag_title'])]
+        flags += [Paragraph('  - ' + _text(flag.title()), styles['body'])
+                  for flag in entities['red_flags']]
+        story.append(_boxed(flags, colors.Color(254 / 255, 226 / 255, 226 / 255)))
+
+    # Final Medical Disclaimer
+    story.append(Spacer(1, 10 * mm))
+    story.append(_boxed(
+        [Paragraph('IMPORTANT MEDICAL DISCLAIMER', styles['disclaimer_title']),
+         Paragraph(MEDICAL_DISCLAIMER, styles['disclaimer'])],
+        colors.Color(1, 243 / 255, 205 / 255)
+    ))
+
+    doc = SimpleDocTemplate(out, pagesize=A4, leftMargin=10 * mm, rightMargin=10 * mm,
+                            topMargin=10 * mm, bottomMargin=25 * mm,
+                            title='DermaCheck AI - SOAP Medical Summary')
+    doc.build(story, onFirstPage=_draw_footer, onLaterPages=_draw_footer)
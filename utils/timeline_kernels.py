@@ -0,0 +1,73 @@
+"""
+Numeric kernels for timeline comparison
+Pure array math shared by batch timeline views, JIT-compiled with Numba when available
+"""
+import numpy as np
+
+try:
+    from numba import njit
+except ImportError:  # Numba is optional - kernels still run as plain NumPy/Python
+    def njit(*args, **kwargs):
+        def decorator(func):
+            return func
+        return decorator
+
+
+# Alert flag bits (combined into one int per comparison)
+ALERT_SIZE_INCREASE = 1
+ALERT_SCORE_INCREASE = 2
+ALERT_RAPID_GROWTH = 4
+
+# Fixed thresholds mirrored from TimelineManager._check_alerts
+SCORE_INCREASE_THRESHOLD = 2
+RAPID_GROWTH_PERCENT = 10.0
+
+SECONDS_PER_DAY = 86400.0
+
+
+@njit(cache=True)
+def compare_timeline(size_arr: np.ndarray, score_arr: np.ndarray, ts_arr: np.ndarray,
+                     size_thresh: float, timeframe_days: int):
+    """
+    Compare every consecutive pair of entries in a lesion timeline
+
+    Args:
+        size_arr: Lesion sizes in mm (float64), oldest first
+        score_arr: ABCDE total scores (float64), oldest first
+        ts_arr: Entry timestamps as epoch seconds (float64), oldest first
+        size_thresh: Size increase alert threshold in percent
+        timeframe_days: Window (days) for the rapid growth alert
+
+    Returns:
+        (size_changes, percent_changes, score_changes, days_elapsed, alert_flags)
+        arrays of length len(size_arr) - 1, entry i comparing i -> i + 1
+    """
+    n = max(size_arr.shape[0] - 1, 0)
+    size_changes = np.empty(n, np.float64)
+    percent_changes = np.empty(n, np.float64)
+    score_changes = np.empty(n, np.float64)
+    days_elapsed = np.empty(n, np.int64)
+    alert_flags = np.zeros(n, np.int64)
+
+    for i in range(n):
+        prev_size = size_arr[i]
+        size_change = size_arr[i + 1] - prev_size
+        percent = (size_change / prev_size) * 100.0 if prev_size > 0 else 0.0
+        score_change = score_arr[i + 1] - score_arr[i]
+        days = int(np.floor((ts_arr[i + 1] - ts_arr[i]) / SECONDS_PER_DAY))
+
+        flags = 0
+        if percent > size_thresh:
+            flags |= ALERT_SIZE_INCREASE
+        if score_change >= SCORE_INCREASE_THRESHOLD:
+            flags |= ALERT_SCORE_INCREASE
+        if days <= timeframe_days and percent > RAPID_GROWTH_PERCENT:
+            flags |= ALERT_RAPID_GROWTH
+
+        size_changes[i] = size_change
+        percent_changes[i] = percent
+        score_changes[i] = score_change
+        days_elapsed[i] = days
+        alert_flags[i] = flags
+
+    return size_changes, percent_changes, score_changes, days_elapsed, alert_flags
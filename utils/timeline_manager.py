@@ -3,13 +3,27 @@ Timeline Manager for tracking lesion progression over time
 Stores and compares historical lesion data
 """
 import json
+import logging
 import os
-from datetime import datetime
-from typing import Dict, List, Optional
-from PIL import Image
 import shutil
+import tempfile
+from collections import Counter
+from datetime import datetime
+from typing import TYPE_CHECKING, Dict, List, Optional
+import numpy as np
 from utils.config import Config
 
+if TYPE_CHECKING:
+    # Only needed for annotations - images arrive already decoded
+    from PIL import Image
+
+
+logger = logging.getLogger(__name__)
+
+# Process umask, read once at import (os.umask can only be read by setting it)
+_UMASK = os.umask(0)
+os.umask(_UMASK)
+
 
 class TimelineManager:
     """
@@ -40,8 +54,8 @@ class TimelineManager:
             try:
                 with open(self.data_file, 'r') as f:
                     return json.load(f)
-            except Exception as e:
-                print(f"Error loading timeline data: {e}")
+            except (ValueError, OSError) as e:  # ValueError covers JSON and Unicode decode errors
+                logger.error("Error loading timeline data: %s", e)
                 return self._get_empty_data()
         return self._get_empty_data()
     
@@ -54,14 +68,28 @@ class TimelineManager:
         }
     
     def _save_data(self):
-        """Save timeline data to file"""
+        """Save timeline data to file (atomically - a crash mid-write keeps the old file)"""
+        tmp_file = None
         try:
-            with open(self.data_file, 'w') as f:
+            # Unique temp file per save - sessions share the data file and save concurrently
+            with tempfile.NamedTemporaryFile(
+                'w', dir=os.path.dirname(self.data_file) or '.',
+                prefix=os.path.basename(self.data_file) + '.', suffix='.tmp', delete=False
+            ) as f:
+                tmp_file = f.name
                 json.dump(self.data, f, indent=2)
+            # NamedTemporaryFile is always 0600 - keep the mode a plain open() would give
+            if os.path.exists(self.data_file):
+                shutil.copymode(self.data_file, tmp_file)
+            else:
+                os.chmod(tmp_file, 0o666 & ~_UMASK)
+            os.replace(tmp_file, self.data_file)
         except Exception as e:
-            print(f"Error saving timeline data: {e}")
+            logger.error("Error saving timeline data: %s", e)
+            if tmp_file and os.path.exists(tmp_file):
+                os.unlink(tmp_file)
     
-    def add_lesion_entry(self, image: Image.Image, abcde_results: Dict, 
+    def add_lesion_entry(self, image: "Image.Image", abcde_results: Dict, 
                         body_location: str, lesion_id: Optional[str] = None) -> str:
         """
         Add new lesion entry or update existing lesion timeline
@@ -75,20 +103,23 @@ class TimelineManager:
         Returns:
             lesion_id for this entry
         """
-        timestamp = datetime.now().isoformat()
+        now = datetime.now()
+        timestamp = now.isoformat()
         
         # Generate lesion_id if not provided
         if lesion_id is None:
             lesion_id = self._generate_lesion_id(body_location)
         
         # Save image
-        image_filename = f"{lesion_id}_{datetime.now().strftime('%Y%m%d_%H%M%S')}.jpg"
+        image_filename = f"{lesion_id}_{now.strftime('%Y%m%d_%H%M%S')}.jpg"
         image_path = os.path.join(self.image_dir, image_filename)
-        image.save(image_path, "JPEG", quality=95)
+        image.save(image_path, "JPEG", quality=Config.TIMELINE_JPEG_QUALITY,
+                   optimize=True, progressive=True)
         
         # Create timeline entry
         entry = {
             "timestamp": timestamp,
+            "ts_epoch": now.timestamp(),
             "image_path": image_path,
             "image_filename": image_filename,
             "abcde_score": abcde_results["total_score"],
@@ -203,9 +234,7 @@ class TimelineManager:
         score_change = entry2["abcde_score"] - entry1["abcde_score"]
         
         # Time difference
-        time1 = datetime.fromisoformat(entry1["timestamp"])
-        time2 = datetime.fromisoformat(entry2["timestamp"])
-        days_elapsed = (time2 - time1).days
+        days_elapsed = int((self._entry_epoch(entry2) - self._entry_epoch(entry1)) // 86400)
         
         # Alert check
         alert = self._check_alerts(size_change_percent, score_change, days_elapsed)
@@ -223,7 +252,66 @@ class TimelineManager:
             "alert": alert
         }
     
-    def _check_alerts(self, size_change_percent: float, score_change: int, 
+    def compare_timeline(self, lesion_id: str) -> Optional[List[Dict]]:
+        """
+        Compare every consecutive pair of entries in a lesion timeline
+
+        Batch counterpart of compare_entries for dashboard views: the numeric
+        diff runs in a single (JIT-compiled) kernel over the whole timeline.
+
+        Args:
+            lesion_id: ID of lesion
+
+        Returns:
+            List of comparison dictionaries (oldest pair first), or None if insufficient data
+        """
+        timeline = self.get_lesion_timeline(lesion_id)
+
+        if not timeline or len(timeline) < 2:
+            return None
+
+        # Imported here so app start-up doesn't pay numba's import cost
+        from utils import timeline_kernels
+
+        sizes = np.array([e["size_mm"] for e in timeline], dtype=np.float64)
+        scores = np.array([e["abcde_score"] for e in timeline], dtype=np.float64)
+        timestamps = np.array([self._entry_epoch(e) for e in timeline], dtype=np.float64)
+
+        (size_changes, percent_changes, score_changes,
+         days_elapsed, alert_flags) = timeline_kernels.compare_timeline(
+            sizes, scores, timestamps,
+            Config.ALERT_SIZE_CHANGE_THRESHOLD * 100, Config.ALERT_TIMEFRAME_DAYS
+        )
+
+        comparisons = []
+        for i in range(len(timeline) - 1):
+            entry1 = timeline[i]
+            entry2 = timeline[i + 1]
+            size_change_percent = float(percent_changes[i])
+            score_change = int(score_changes[i])
+            days = int(days_elapsed[i])
+
+            # Alert messages are only built for flagged pairs
+            alert = None
+            if alert_flags[i]:
+                alert = self._check_alerts(size_change_percent, score_change, days)
+
+            comparisons.append({
+                "entry1": entry1,
+                "entry2": entry2,
+                "changes": {
+                    "size_mm": float(size_changes[i]),
+                    "size_percent": size_change_percent,
+                    "score": score_change,
+                    "risk_level_change": entry1["risk_level"] != entry2["risk_level"]
+                },
+                "time_elapsed_days": days,
+                "alert": alert
+            })
+
+        return comparisons
+
+    def _check_alerts(self, size_change_percent: float, score_change: int,
                      days_elapsed: int) -> Optional[Dict]:
         """
         Check if changes warrant an alert
@@ -271,6 +359,14 @@ class TimelineManager:
         
         return None
     
+    @staticmethod
+    def _entry_epoch(entry: Dict) -> float:
+        """Entry timestamp as epoch seconds (parses ISO string for entries saved before ts_epoch)"""
+        ts_epoch = entry.get("ts_epoch")
+        if ts_epoch is None:
+            ts_epoch = datetime.fromisoformat(entry["timestamp"]).timestamp()
+        return ts_epoch
+    
     def _find_lesion(self, lesion_id: str) -> Optional[Dict]:
         """Find lesion by ID"""
         for lesion in self.data["lesions"]:
@@ -311,7 +407,7 @@ class TimelineManager:
                 try:
                     os.remove(image_path)
                 except Exception as e:
-                    print(f"Error deleting image {image_path}: {e}")
+                    logger.error("Error deleting image %s: %s", image_path, e)
         
         # Remove from data
         self.data["lesions"] = [l for l in self.data["lesions"] 
@@ -330,20 +426,11 @@ class TimelineManager:
         total_lesions = len(self.data["lesions"])
         total_entries = sum(len(l["timeline"]) for l in self.data["lesions"])
         
-        # Risk distribution
-        high_risk_count = 0
-        medium_risk_count = 0
-        low_risk_count = 0
-        
-        for lesion in self.data["lesions"]:
-            latest = lesion["timeline"][-1]
-            risk = latest["risk_level"]
-            if risk == "HIGH":
-                high_risk_count += 1
-            elif risk == "MEDIUM":
-                medium_risk_count += 1
-            else:
-                low_risk_count += 1
+        # Risk distribution (latest entry of each lesion)
+        risk_counts = Counter(l["timeline"][-1]["risk_level"] for l in self.data["lesions"])
+        high_risk_count = risk_counts.get("HIGH", 0)
+        medium_risk_count = risk_counts.get("MEDIUM", 0)
+        low_risk_count = total_lesions - high_risk_count - medium_risk_count
         
         return {
             "total_lesions": total_lesions,